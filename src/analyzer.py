@@ -1,20 +1,157 @@
-import json
+import logging
 import os
 import random
 import time
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 import google.generativeai as genai
+import orjson
 from dotenv import load_dotenv
 
+from .cache import TieredCache, cache_key
 from .models import Discrepancy, Platform, ProfileData, TrustScore, VerificationReport
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Seconds a Gemini analysis is reused for identical profile data
+ANALYSIS_TTL = 24 * 60 * 60
+
+# ProfileData fields the analysis guidelines actually use; the rest is not sent
+ANALYSIS_FIELDS = {
+    "platform",
+    "handle",
+    "name",
+    "bio",
+    "location",
+    "company",
+    "job_title",
+    "followers",
+    "following",
+    "verified",
+    "joined_date",
+}
+MAX_POSTS_SAMPLE = 5
+MAX_POST_CHARS = 200
+
+# additional_data keys that flag login-wall stubs and scraped estimates
+ANALYSIS_EXTRA_KEYS = ("error", "scraped_from_web", "note")
+
+# Instructions, response schema and guidelines shared by every analysis request
+STATIC_PROMPT = """You are a social profile verification system designed to analyze and cross-verify user profiles across multiple platforms.
+
+TASK: Analyze the normalized profile data that follows these instructions and provide a comprehensive verification report.
+
+ANALYSIS GOALS:
+1. Determine if all profiles likely belong to the same person/organization (confidence: 0-100)
+2. Identify discrepancies between profiles (name, bio, location, job title, etc.)
+3. Assess reputation signals (follower quality, engagement, credibility indicators)
+4. Calculate trust scores across multiple dimensions
+5. Detect potential red flags (inconsistencies, suspicious activity, fake profiles)
+6. Highlight strengths and positive signals
+7. Provide reasoning with specific citations from the data
+
+Please provide your analysis in the following JSON format (ensure valid JSON syntax):
+
+```json
+{
+  "same_person_confidence": [0-100 integer],
+  "trust_score": {
+    "overall": [0-100 integer],
+    "reputation": [0-100 integer],
+    "consistency": [0-100 integer],
+    "content_quality": [0-100 integer]
+  },
+  "consistency_score": [0-100 integer],
+  "discrepancies": [
+    {
+      "field": "name/bio/location/job_title/etc",
+      "platforms": ["platform1", "platform2"],
+      "values": {
+        "platform1": "value1",
+        "platform2": "value2"
+      },
+      "severity": "low/medium/high"
+    }
+  ],
+  "red_flags": [
+    "List of concerning findings with specific examples"
+  ],
+  "strengths": [
+    "List of positive signals and credibility indicators"
+  ],
+  "citations": [
+    "Specific examples from the data that support your analysis"
+  ],
+  "analysis_summary": "Detailed summary of your findings and reasoning"
+}
+```
+
+ANALYSIS GUIDELINES:
+- Be thorough but concise
+- Focus on factual observations from the provided data
+- Consider platform-specific norms (GitHub for technical profiles, LinkedIn for professional, etc.)
+- Look for patterns that suggest authenticity vs. fabrication
+- Consider follower counts, verification status, content quality, and cross-platform consistency
+- Highlight both positive and negative indicators
+- Provide specific examples and citations from the data
+- Profiles whose additional_data has an "error" (e.g. "login_wall") could not be fetched; do not treat their missing fields as evidence"""
+
+
+class _JsonObjectScanner:
+    """Tracks brace depth across streamed text, ignoring braces inside strings"""
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.done = False
+
+    def feed(self, text: str) -> str:
+        """Return the part of text that belongs to the first JSON object"""
+        start = 0
+        if self.depth == 0:
+            # Skip any markdown fence or prose before the object opens
+            start = text.find("{")
+            if start < 0:
+                return ""
+
+        for i in range(start, len(text)):
+            if self._step(text[i]):
+                self.done = True
+                return text[start : i + 1]
+        return text[start:]
+
+    def _step(self, ch: str) -> bool:
+        """Advance over one character, returning True once the object closes"""
+        if self.in_string:
+            self._step_in_string(ch)
+        elif ch == '"':
+            self.in_string = True
+        elif ch == "{":
+            self.depth += 1
+        elif ch == "}":
+            self.depth -= 1
+            return self.depth == 0
+        return False
+
+    def _step_in_string(self, ch: str) -> None:
+        if self.escaped:
+            self.escaped = False
+        elif ch == "\\":
+            self.escaped = True
+        elif ch == '"':
+            self.in_string = False
+
 
 class GeminiAnalyzer:
     """Analyzes profile data using Google Gemini API"""
 
+    # Fixed framing around the per-request profile JSON, built once
+    _PROFILE_DATA_PREFIX = "\n\nPROFILE DATA:\n```json\n"
+    _PROFILE_DATA_SUFFIX = "\n```"
+
     def __init__(self, model_name: str = "gemini-1.5-pro", max_retries: int = 3):
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
@@ -23,28 +160,42 @@ class GeminiAnalyzer:
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model_name)
         self.max_retries = max_retries
+        self.cache = TieredCache("analysis")
 
     def analyze_profiles(self, profiles: List[ProfileData]) -> VerificationReport:
         """Analyze multiple profiles and generate verification report"""
 
-        # Prepare data for Gemini
-        profiles_json = []
-        for profile in profiles:
-            profiles_json.append(profile.model_dump())
+        # Prepare data for Gemini, keeping only the fields the analysis uses
+        profiles_json = orjson.dumps(
+            [self._project_for_analysis(p) for p in profiles]
+        ).decode()
 
-        prompt = self._build_analysis_prompt(profiles_json)
+        # Reuse a previous analysis of identical profile data
+        key = cache_key(profiles_json)
+        cached_text = self.cache.get(key)
+        if cached_text is not None:
+            cached_result = self._parse_gemini_response(cached_text, profiles)
+            if cached_result is not None:
+                return cached_result
+
+        profile_prompt = self._build_profile_data_prompt(profiles_json)
 
         # Try with retry logic
         for attempt in range(self.max_retries):
             try:
-                response = self._call_gemini_with_retry(prompt, attempt)
-                analysis_result = self._parse_gemini_response(response.text, profiles)
+                response = self._call_gemini_with_retry(profile_prompt, attempt)
+                json_str = self._read_json_object(response)
+                analysis_result = self._parse_gemini_response(json_str, profiles)
+                if analysis_result is None:
+                    return self._create_fallback_report(profiles)
+
+                self.cache.set(key, json_str, expire=ANALYSIS_TTL)
                 return analysis_result
 
             except Exception as e:
                 if attempt == self.max_retries - 1:  # Last attempt
                     print("❌ Final attempt failed. Using fallback analysis.")
-                    print(f"Error: {str(e)}")
+                    logger.exception("Gemini analysis failed")
                     return self._create_fallback_report(profiles, str(e))
                 else:
                     print(f"⚠️  Attempt {attempt + 1} failed, retrying...")
@@ -52,15 +203,26 @@ class GeminiAnalyzer:
 
         return self._create_fallback_report(profiles)
 
-    def _call_gemini_with_retry(self, prompt: str, attempt: int) -> any:
-        """Call Gemini API with exponential backoff"""
+    def _call_gemini_with_retry(self, profile_prompt: str, attempt: int) -> any:
+        """Call Gemini API with exponential backoff, streaming the response"""
         if attempt > 0:
             # Exponential backoff with jitter
             delay = (2**attempt) + random.uniform(0, 1)
             print(f"⏳ Waiting {delay:.1f}s before retry...")
             time.sleep(delay)
 
-        return self.model.generate_content(prompt)
+        return self.model.generate_content(STATIC_PROMPT + profile_prompt, stream=True)
+
+    def _read_json_object(self, response: Iterable) -> str:
+        """Accumulate streamed text until the first JSON object closes"""
+        scanner = _JsonObjectScanner()
+        parts: List[str] = []
+        for chunk in response:
+            parts.append(scanner.feed(chunk.text))
+            if scanner.done:
+                # Stop reading; Gemini's trailing prose is not needed
+                break
+        return "".join(parts)
 
     def _handle_api_error(self, error: Exception, attempt: int) -> None:
         """Handle different types of API errors with appropriate messaging"""
@@ -81,91 +243,35 @@ class GeminiAnalyzer:
         else:
             print(f"🌐 Network or API error: {str(error)[:100]}...")
 
-    def _build_analysis_prompt(self, profiles_data: List[dict]) -> str:
-        """Build structured prompt for Gemini analysis"""
-
-        prompt = (
-            """You are a social profile verification system designed to analyze and cross-verify user profiles across multiple platforms.
-
-TASK: Analyze the following normalized profile data and provide a comprehensive verification report.
-
-ANALYSIS GOALS:
-1. Determine if all profiles likely belong to the same person/organization (confidence: 0-100)
-2. Identify discrepancies between profiles (name, bio, location, job title, etc.)
-3. Assess reputation signals (follower quality, engagement, credibility indicators)
-4. Calculate trust scores across multiple dimensions
-5. Detect potential red flags (inconsistencies, suspicious activity, fake profiles)
-6. Highlight strengths and positive signals
-7. Provide reasoning with specific citations from the data
-
-PROFILE DATA:
-```json
-"""
-            + json.dumps(profiles_data, indent=2)
-            + """
-```
-
-Please provide your analysis in the following JSON format (ensure valid JSON syntax):
-
-```json
-{
-  "same_person_confidence": [0-100 integer],
-  "trust_score": {
-    "overall": [0-100 integer],
-    "reputation": [0-100 integer],
-    "consistency": [0-100 integer],
-    "content_quality": [0-100 integer]
-  },
-  "consistency_score": [0-100 integer],
-  "discrepancies": [
-    {
-      "field": "name/bio/location/job_title/etc",
-      "platforms": ["platform1", "platform2"],
-      "values": {
-        "platform1": "value1",
-        "platform2": "value2"
-      },
-      "severity": "low/medium/high"
-    }
-  ],
-  "red_flags": [
-    "List of concerning findings with specific examples"
-  ],
-  "strengths": [
-    "List of positive signals and credibility indicators"
-  ],
-  "citations": [
-    "Specific examples from the data that support your analysis"
-  ],
-  "analysis_summary": "Detailed summary of your findings and reasoning"
-}
-```
-
-ANALYSIS GUIDELINES:
-- Be thorough but concise
-- Focus on factual observations from the provided data
-- Consider platform-specific norms (GitHub for technical profiles, LinkedIn for professional, etc.)
-- Look for patterns that suggest authenticity vs. fabrication
-- Consider follower counts, verification status, content quality, and cross-platform consistency
-- Highlight both positive and negative indicators
-- Provide specific examples and citations from the data"""
+    def _project_for_analysis(self, profile: ProfileData) -> dict:
+        """Reduce a profile to the analysed fields with a trimmed posts sample"""
+        lean = profile.model_dump(
+            mode="json", include=ANALYSIS_FIELDS, exclude_none=True
         )
-
-        return prompt
+        lean["posts_sample"] = [
+            post[:MAX_POST_CHARS] for post in profile.posts_sample[:MAX_POSTS_SAMPLE]
+        ]
+        extra = {
+            key: profile.additional_data[key]
+            for key in ANALYSIS_EXTRA_KEYS
+            if key in profile.additional_data
+        }
+        if extra:
+            lean["additional_data"] = extra
+        return lean
+
+    def _build_profile_data_prompt(self, profiles_json: str) -> str:
+        """Build the per-request part of the prompt holding the profile data"""
+        return self._PROFILE_DATA_PREFIX + profiles_json + self._PROFILE_DATA_SUFFIX
 
     def _parse_gemini_response(
-        self, response_text: str, profiles: List[ProfileData]
-    ) -> VerificationReport:
-        """Parse Gemini's JSON response into VerificationReport"""
+        self, json_str: str, profiles: List[ProfileData]
+    ) -> Optional[VerificationReport]:
+        """Parse Gemini's JSON response into VerificationReport, or None on failure"""
 
         try:
-            # Extract JSON from response (handle markdown code blocks)
-            json_start = response_text.find("{")
-            json_end = response_text.rfind("}") + 1
-
-            if json_start >= 0 and json_end > json_start:
-                json_str = response_text[json_start:json_end]
-                data = json.loads(json_str)
+            if json_str:
+                data = orjson.loads(json_str)
 
                 # Parse discrepancies
                 discrepancies = []
@@ -200,10 +306,10 @@ ANALYSIS GUIDELINES:
                     same_person_confidence=data.get("same_person_confidence", 50),
                 )
 
-        except Exception as e:
-            print(f"Error parsing Gemini response: {e}")
+        except Exception:
+            logger.exception("Error parsing Gemini response")
 
-        return self._create_fallback_report(profiles)
+        return None
 
     def _create_fallback_report(
         self, profiles: List[ProfileData], error_msg: Optional[str] = None
@@ -0,0 +1,59 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import diskcache
+
+CACHE_DIR = os.getenv("PROVERIFIER_CACHE_DIR", "./.cache")
+
+
+def cache_key(text: str) -> str:
+    """Build a stable cache key from arbitrary text"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class TieredCache:
+    """Bounded in-process LRU in front of a persistent on-disk cache"""
+
+    def __init__(self, name: str, memory_size: int = 256):
+        self._disk = diskcache.Cache(os.path.join(CACHE_DIR, name))
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._memory_size = memory_size
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.time():
+                    self._memory.move_to_end(key)
+                    return value
+                del self._memory[key]
+
+        value, expires_at = self._disk.get(key, expire_time=True)
+        if value is not None and expires_at is not None:
+            self._remember(key, value, expires_at)
+        return value
+
+    def set(self, key: str, value: Any, expire: float) -> None:
+        """Store a value in both tiers for `expire` seconds"""
+        self._disk.set(key, value, expire=expire)
+        self._remember(key, value, time.time() + expire)
+
+    def delete(self, key: str) -> None:
+        """Remove a key from both tiers"""
+        with self._lock:
+            self._memory.pop(key, None)
+        self._disk.delete(key)
+
+    def _remember(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            if len(self._memory) > self._memory_size:
+                self._memory.popitem(last=False)
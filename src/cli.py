@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 import json
+import logging
 import os
 import sys
 from typing import List
+from urllib.parse import urlsplit, urlunsplit
 
 import click
 
 from .analyzer import GeminiAnalyzer
 from .fetchers.manager import FetcherManager
+from .models import PLATFORM_LABELS
 from .report_generator import ReportGenerator
 
 
@@ -26,7 +29,10 @@ from .report_generator import ReportGenerator
     help="Output format (markdown, pdf, or both)",
 )
 @click.option("--user-id", "-u", help="Optional user identifier")
-def verify_profiles(profiles: str, output_dir: str, format: str, user_id: str) -> None:
+@click.option("--verbose", "-v", is_flag=True, help="Log fetch timings and details")
+def verify_profiles(
+    profiles: str, output_dir: str, format: str, user_id: str, verbose: bool
+) -> None:
     """Social Profile Verification Tool
 
     Analyze social media profiles across platforms and generate trust reports.
@@ -46,9 +52,17 @@ def verify_profiles(profiles: str, output_dir: str, format: str, user_id: str) -
     python -m src.cli --profiles profiles.json --format pdf --output-dir ./my_reports
     """
 
+    logging.basicConfig(
+        level=logging.INFO if verbose else logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s",
+    )
+
     try:
         # Parse profiles input
         profile_urls = _parse_profiles_input(profiles)
+
+        # Drop duplicates such as github.com/x and github.com/x/, keeping order
+        profile_urls = list(dict.fromkeys(_canonicalize_url(u) for u in profile_urls))
         if not profile_urls:
             click.echo(
                 "❌ No valid profile URLs found. Please provide profiles in JSON format.",
@@ -142,6 +156,18 @@ def _parse_profiles_input(profiles_input: str) -> List[str]:
         return []
 
 
+def _canonicalize_url(url: str) -> str:
+    """Normalize a profile URL so equivalent spellings compare equal"""
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+
+    parts = urlsplit(url)
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), "", "")
+    )
+
+
 def _get_timestamp() -> str:
     """Get current timestamp for file naming"""
     from datetime import datetime
@@ -177,7 +203,7 @@ def _display_summary(report: any, report_paths: List[str]) -> None:
     click.echo(f"📊 Profiles Analyzed: {len(report.profiles_analyzed)}")
 
     # Show platforms
-    platforms = [p.platform.value.title() for p in report.profiles_analyzed]
+    platforms = [PLATFORM_LABELS[p.platform] for p in report.profiles_analyzed]
     click.echo(f"🌐 Platforms: {', '.join(platforms)}")
 
     # Red flags count
@@ -1,22 +1,93 @@
+import asyncio
 import re
+import threading
 from abc import ABC, abstractmethod
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
 
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
 
 from ..models import ProfileData
 
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+_WS = re.compile(r"\s+")
+_NUM_FLOAT = re.compile(r"\d+\.?\d*")
+_NUM_INT = re.compile(r"\d+")
+
+# Responses smaller than this cannot contain a rendered profile page
+MIN_PROFILE_HTML_SIZE = 1024
+
+# Retry transient failures with exponential backoff, honouring Retry-After
+RETRY_POLICY = Retry(
+    total=5,
+    backoff_factor=0.3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    respect_retry_after_header=True,
+)
+
+
+def _retry_delay(retries_done: int, headers: Optional[Mapping[str, str]]) -> float:
+    """Backoff before the next attempt, as urllib3 computes it for RETRY_POLICY"""
+    delay = min(
+        RETRY_POLICY.backoff_factor * 2.0**retries_done, Retry.DEFAULT_BACKOFF_MAX
+    )
+    retry_after = headers.get("Retry-After") if headers is not None else None
+    if retry_after and RETRY_POLICY.respect_retry_after_header:
+        try:
+            delay = max(delay, RETRY_POLICY.parse_retry_after(retry_after))
+        except InvalidHeader:
+            pass
+    return delay
+
+
+# One pooled session per thread, shared across fetchers, so requests to the
+# same host reuse connections; requests.Session itself is not thread-safe
+_thread_sessions = threading.local()
+
+
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+
+    adapter = HTTPAdapter(
+        pool_connections=16, pool_maxsize=64, max_retries=RETRY_POLICY
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the calling thread's shared requests session"""
+    session = getattr(_thread_sessions, "session", None)
+    if session is None:
+        session = _create_session()
+        _thread_sessions.session = session
+    return session
+
 
 class BaseFetcher(ABC):
     """Base class for all profile fetchers"""
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-        )
+    # Hostnames routed straight to this fetcher by FetcherManager
+    hosts: Tuple[str, ...] = ()
+
+    # Final-URL path prefixes that mark a redirect to a login or challenge page
+    login_wall_markers: Tuple[str, ...] = ()
+
+    @property
+    def session(self) -> requests.Session:
+        """Session shared by every fetcher on the current thread"""
+        return get_session()
 
     @abstractmethod
     def can_handle(self, url: str) -> bool:
@@ -28,11 +99,65 @@ class BaseFetcher(ABC):
         """Extract profile data from the given URL"""
         pass
 
+    @abstractmethod
+    async def fetch_profile_async(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Optional[ProfileData]:
+        """Extract profile data from the given URL using a shared aiohttp session"""
+        pass
+
+    def invalidate(self, url: str) -> None:
+        """Drop anything this fetcher has cached for the URL"""
+        pass
+
+    async def _get_content_async(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Optional[Tuple[str, bytes]]:
+        """Download a page, returning its final URL and body, or None on non-200"""
+        async with self._request_with_retry(session, "GET", url) as response:
+            if response.status != 200:
+                return None
+            return str(response.url), await response.read()
+
+    @asynccontextmanager
+    async def _request_with_retry(
+        self, session: aiohttp.ClientSession, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """aiohttp request retrying transient failures the way RETRY_POLICY does"""
+        retries = RETRY_POLICY.total or 0
+        for attempt in range(retries + 1):
+            headers = None
+            try:
+                response = await session.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == retries:
+                    raise
+            else:
+                if (
+                    response.status not in (RETRY_POLICY.status_forcelist or ())
+                    or attempt == retries
+                ):
+                    try:
+                        yield response
+                    finally:
+                        response.release()
+                    return
+                headers = response.headers
+                response.release()
+            await asyncio.sleep(_retry_delay(attempt, headers))
+
+    def _is_login_wall(self, final_url: str, html: bytes) -> bool:
+        """Check whether a response is a login wall rather than a profile page"""
+        path = urlsplit(final_url).path
+        if any(path.startswith(marker) for marker in self.login_wall_markers):
+            return True
+        return len(html) < MIN_PROFILE_HTML_SIZE
+
     def _clean_text(self, text: Optional[str]) -> Optional[str]:
         """Clean and normalize text"""
         if not text:
             return None
-        return re.sub(r"\s+", " ", text.strip())
+        return _WS.sub(" ", text.strip())
 
     def _extract_number(self, text: str) -> Optional[int]:
         """Extract number from text (e.g., '1.2K followers' -> 1200)"""
@@ -47,13 +172,13 @@ class BaseFetcher(ABC):
         for suffix, multiplier in multipliers.items():
             if suffix in text:
                 try:
-                    number = float(re.findall(r"\d+\.?\d*", text)[0])
+                    number = float(_NUM_FLOAT.findall(text)[0])
                     return int(number * multiplier)
                 except (IndexError, ValueError):
                     continue
 
         # Extract plain number
         try:
-            return int(re.findall(r"\d+", text)[0])
+            return int(_NUM_INT.findall(text)[0])
         except (IndexError, ValueError):
             return None
@@ -1,83 +1,434 @@
+import asyncio
+import logging
+import os
+import random
 import re
-from typing import Optional
+import threading
+import time
+from typing import Any, List, Mapping, Optional, Tuple
 
+import aiohttp
+import orjson
+import requests
+
+from ..cache import TieredCache, cache_key
 from ..models import Platform, ProfileData
 from .base import BaseFetcher
 
+logger = logging.getLogger(__name__)
+
+_USERNAME_RE = re.compile(r"github\.com/([^/]+)")
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# User fields, top-5 recently updated public repos and their last 3 commits
+GRAPHQL_QUERY = """
+query($login: String!) {
+  user(login: $login) {
+    login name bio location company email avatarUrl websiteUrl createdAt
+    isHireable twitterUsername
+    followers { totalCount }
+    following { totalCount }
+    gists { totalCount }
+    publicRepos: repositories(privacy: PUBLIC) { totalCount }
+    repositories(
+      first: 5, privacy: PUBLIC, orderBy: {field: UPDATED_AT, direction: DESC}
+    ) {
+      nodes {
+        name
+        description
+        defaultBranchRef {
+          target { ... on Commit { history(first: 3) { nodes { message } } } }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Longest we are willing to block waiting for an exhausted quota to reset
+MAX_RATE_LIMIT_WAIT = 60
+RATE_LIMIT_RETRIES = 1
+
+# How long REST bodies are kept for If-None-Match revalidation (304s are free)
+ETAG_TTL = 7 * 24 * 60 * 60
+
+
+class GitHubRateLimitError(Exception):
+    """Raised when the GitHub quota will not reset within MAX_RATE_LIMIT_WAIT"""
+
+
+class GitHubBucket:
+    """Tracks GitHub's fixed-window quota from the X-RateLimit-* headers"""
+
+    def __init__(self):
+        # Unknown until the first response reports the window
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a call from the quota, waiting briefly for a reset if exhausted"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Take a call from the quota without blocking the event loop"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Sync the remaining calls and reset time with the server-reported quota"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        with self._lock:
+            self.remaining = int(remaining)
+            self.reset_at = float(reset)
+
+    def rate_limited_delay(
+        self, status: int, headers: Mapping[str, str]
+    ) -> Optional[float]:
+        """Seconds to wait before retrying an exhausted-quota response, if worth it"""
+        if status not in (403, 429) or headers.get("X-RateLimit-Remaining") != "0":
+            return None
+
+        reset = int(headers.get("X-RateLimit-Reset", 0))
+        delay = max(reset - time.time(), 0) + random.uniform(0, 1)
+        return delay if delay <= MAX_RATE_LIMIT_WAIT else None
+
+    def _reserve(self) -> float:
+        """Take a call and return how long to wait before making it"""
+        with self._lock:
+            now = time.time()
+            if self.remaining is None or now >= self.reset_at:
+                # GitHub refills the whole quota at reset; the next response
+                # reports the new window
+                self.remaining = None
+                return 0.0
+            if self.remaining > 0:
+                self.remaining -= 1
+                return 0.0
+            delay = self.reset_at - now + random.uniform(0, 1)
+
+        if delay > MAX_RATE_LIMIT_WAIT:
+            raise GitHubRateLimitError(
+                f"GitHub rate limit exhausted, resets in {delay:.0f}s"
+            )
+        return delay
+
+
+# Shared by all GitHubFetcher instances since the quota is per token/IP
+github_bucket = GitHubBucket()
+
 
 class GitHubFetcher(BaseFetcher):
     """Fetcher for GitHub profiles"""
 
+    hosts = ("github.com", "www.github.com")
+
+    def __init__(self):
+        super().__init__()
+        self.etag_cache = TieredCache("github_etags")
+
     def can_handle(self, url: str) -> bool:
         return "github.com" in url.lower()
 
     def extract_profile_data(self, url: str) -> Optional[ProfileData]:
         try:
             # Extract username from URL
-            username_match = re.search(r"github\.com/([^/]+)", url)
+            username_match = _USERNAME_RE.search(url)
             if not username_match:
                 return None
 
             username = username_match.group(1)
 
-            # Use GitHub API for reliable data
-            api_url = f"https://api.github.com/users/{username}"
-            response = self.session.get(api_url)
+            # Prefer a single GraphQL round trip when a token is available
+            token = os.getenv("GITHUB_TOKEN")
+            if token:
+                response = self._request(
+                    "POST",
+                    GRAPHQL_URL,
+                    json=self._graphql_payload(username),
+                    headers={"Authorization": f"bearer {token}"},
+                )
+                if response.status_code == 200:
+                    payload = orjson.loads(response.content)
+                    profile = self._build_profile_from_graphql(username, payload)
+                    if profile is not None or self._graphql_not_found(payload):
+                        return profile
 
-            if response.status_code != 200:
+            # Fall back to the REST API, e.g. when GraphQL is rate limited
+            data = self._get_json(f"https://api.github.com/users/{username}")
+            if data is None:
                 return None
 
-            data = response.json()
-
             # Get recent repositories for content analysis
             repos_url = (
                 f"https://api.github.com/users/{username}/repos?sort=updated&per_page=5"
             )
-            repos_response = self.session.get(repos_url)
-            repos_data = (
-                repos_response.json() if repos_response.status_code == 200 else []
+            repos_data = self._get_json(repos_url) or []
+
+            # Get recent commits
+            commits_by_repo = [
+                self._get_json(self._commits_url(username, repo["name"])) or []
+                for repo in repos_data
+            ]
+
+            return self._build_profile(username, data, repos_data, commits_by_repo)
+
+        except GitHubRateLimitError as e:
+            logger.warning("Skipping GitHub profile %s: %s", url, e)
+            return None
+        except Exception:
+            logger.exception("Error fetching GitHub profile %s", url)
+            return None
+
+    async def fetch_profile_async(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Optional[ProfileData]:
+        try:
+            username_match = _USERNAME_RE.search(url)
+            if not username_match:
+                return None
+
+            username = username_match.group(1)
+
+            token = os.getenv("GITHUB_TOKEN")
+            if token:
+                status, _, body = await self._request_async(
+                    session,
+                    "POST",
+                    GRAPHQL_URL,
+                    json=self._graphql_payload(username),
+                    headers={"Authorization": f"bearer {token}"},
+                )
+                if status == 200:
+                    payload = orjson.loads(body)
+                    profile = self._build_profile_from_graphql(username, payload)
+                    if profile is not None or self._graphql_not_found(payload):
+                        return profile
+
+            data = await self._get_json_async(
+                session, f"https://api.github.com/users/{username}"
+            )
+            if data is None:
+                return None
+
+            repos_url = (
+                f"https://api.github.com/users/{username}/repos?sort=updated&per_page=5"
+            )
+            repos_data = await self._get_json_async(session, repos_url) or []
+
+            # Commit lookups are independent per repo, so run them concurrently
+            commits_by_repo = await asyncio.gather(
+                *(
+                    self._get_json_async(
+                        session, self._commits_url(username, repo["name"])
+                    )
+                    for repo in repos_data
+                )
+            )
+
+            return self._build_profile(
+                username, data, repos_data, [c or [] for c in commits_by_repo]
+            )
+
+        except GitHubRateLimitError as e:
+            logger.warning("Skipping GitHub profile %s: %s", url, e)
+            return None
+        except Exception:
+            logger.exception("Error fetching GitHub profile %s", url)
+            return None
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Issue a rate-limited GitHub API request"""
+        response = self._send(method, url, **kwargs)
+        for _ in range(RATE_LIMIT_RETRIES):
+            delay = github_bucket.rate_limited_delay(
+                response.status_code, response.headers
+            )
+            if delay is None:
+                break
+            time.sleep(delay)
+            response = self._send(method, url, **kwargs)
+        return response
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        github_bucket.acquire()
+        response = self.session.request(method, url, **kwargs)
+        github_bucket.update_from_headers(response.headers)
+        return response
+
+    async def _request_async(
+        self, session: aiohttp.ClientSession, method: str, url: str, **kwargs: Any
+    ) -> Tuple[int, Mapping[str, str], bytes]:
+        """Issue a rate-limited GitHub API request, returning status, headers, body"""
+        status, headers, body = await self._send_async(session, method, url, **kwargs)
+        for _ in range(RATE_LIMIT_RETRIES):
+            delay = github_bucket.rate_limited_delay(status, headers)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            status, headers, body = await self._send_async(
+                session, method, url, **kwargs
             )
+        return status, headers, body
+
+    async def _send_async(
+        self, session: aiohttp.ClientSession, method: str, url: str, **kwargs: Any
+    ) -> Tuple[int, Mapping[str, str], bytes]:
+        await github_bucket.acquire_async()
+        async with self._request_with_retry(session, method, url, **kwargs) as response:
+            github_bucket.update_from_headers(response.headers)
+            return response.status, response.headers, await response.read()
+
+    def _get_json(self, url: str) -> Optional[Any]:
+        """GET a REST endpoint, revalidating a cached body via If-None-Match"""
+        key = cache_key(url)
+        cached = self.etag_cache.get(key)
+        headers = {"If-None-Match": cached["etag"]} if cached else {}
+
+        try:
+            response = self._request("GET", url, headers=headers)
+        except GitHubRateLimitError as e:
+            logger.warning("Skipping %s: %s", url, e)
+            return None
+        return self._read_revalidated(
+            key, cached, response.status_code, response.headers, response.content
+        )
+
+    async def _get_json_async(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Optional[Any]:
+        """GET a REST endpoint, revalidating a cached body via If-None-Match"""
+        key = cache_key(url)
+        cached = self.etag_cache.get(key)
+        headers = {"If-None-Match": cached["etag"]} if cached else {}
 
-            # Extract recent commit messages or repo descriptions
-            posts_sample = []
-            for repo in repos_data:
-                if repo.get("description"):
-                    posts_sample.append(f"Repo: {repo['name']} - {repo['description']}")
-
-                # Get recent commits
-                commits_url = f"https://api.github.com/repos/{username}/{repo['name']}/commits?per_page=3"
-                commits_response = self.session.get(commits_url)
-                if commits_response.status_code == 200:
-                    commits = commits_response.json()
-                    for commit in commits:
-                        if commit.get("commit", {}).get("message"):
-                            posts_sample.append(
-                                f"Commit: {commit['commit']['message']}"
-                            )
-
-            return ProfileData(
-                platform=Platform.GITHUB,
-                handle=data.get("login", username),
-                name=self._clean_text(data.get("name")),
-                bio=self._clean_text(data.get("bio")),
-                location=self._clean_text(data.get("location")),
-                followers=data.get("followers"),
-                following=data.get("following"),
-                verified=None,  # GitHub doesn't have verification badges
-                posts_sample=posts_sample[:10],  # Limit to 10 samples
-                profile_image_url=data.get("avatar_url"),
-                website=data.get("blog"),
-                joined_date=data.get("created_at"),
-                company=self._clean_text(data.get("company")),
-                email=data.get("email"),
-                additional_data={
-                    "public_repos": data.get("public_repos", 0),
-                    "public_gists": data.get("public_gists", 0),
-                    "hireable": data.get("hireable"),
-                    "twitter_username": data.get("twitter_username"),
-                },
+        try:
+            status, response_headers, body = await self._request_async(
+                session, "GET", url, headers=headers
             )
+        except GitHubRateLimitError as e:
+            logger.warning("Skipping %s: %s", url, e)
+            return None
+        return self._read_revalidated(key, cached, status, response_headers, body)
+
+    def _read_revalidated(
+        self,
+        key: str,
+        cached: Optional[dict],
+        status: int,
+        headers: Mapping[str, str],
+        body: bytes,
+    ) -> Optional[Any]:
+        """Decode a conditional GET, serving the cached body on 304 Not Modified"""
+        if status == 304 and cached is not None:
+            return orjson.loads(cached["body"])
+        if status != 200:
+            return None
+
+        etag = headers.get("ETag")
+        if etag:
+            self.etag_cache.set(key, {"etag": etag, "body": body}, expire=ETAG_TTL)
+        return orjson.loads(body)
+
+    def _commits_url(self, username: str, repo_name: str) -> str:
+        return f"https://api.github.com/repos/{username}/{repo_name}/commits?per_page=3"
+
+    def _graphql_payload(self, username: str) -> dict:
+        return {"query": GRAPHQL_QUERY, "variables": {"login": username}}
 
-        except Exception as e:
-            print(f"Error fetching GitHub profile: {e}")
+    def _graphql_not_found(self, payload: dict) -> bool:
+        """Whether a GraphQL response reports that the user does not exist"""
+        return any(
+            error.get("type") == "NOT_FOUND" for error in payload.get("errors") or []
+        )
+
+    def _build_profile_from_graphql(
+        self, username: str, payload: dict
+    ) -> Optional[ProfileData]:
+        """Map a GraphQL user payload onto the REST shapes used by _build_profile"""
+        user = (payload.get("data") or {}).get("user")
+        if not user:
             return None
+
+        data = {
+            "login": user.get("login"),
+            "name": user.get("name"),
+            "bio": user.get("bio"),
+            "location": user.get("location"),
+            "company": user.get("company"),
+            # GraphQL returns an empty string when the email is not public
+            "email": user.get("email") or None,
+            "avatar_url": user.get("avatarUrl"),
+            "blog": user.get("websiteUrl"),
+            "created_at": user.get("createdAt"),
+            "followers": (user.get("followers") or {}).get("totalCount"),
+            "following": (user.get("following") or {}).get("totalCount"),
+            "public_repos": (user.get("publicRepos") or {}).get("totalCount", 0),
+            "public_gists": (user.get("gists") or {}).get("totalCount", 0),
+            "hireable": user.get("isHireable"),
+            "twitter_username": user.get("twitterUsername"),
+        }
+
+        repos_data = []
+        commits_by_repo = []
+        for repo in (user.get("repositories") or {}).get("nodes") or []:
+            repos_data.append(
+                {"name": repo.get("name"), "description": repo.get("description")}
+            )
+            target = (repo.get("defaultBranchRef") or {}).get("target") or {}
+            history = (target.get("history") or {}).get("nodes") or []
+            commits_by_repo.append(
+                [{"commit": {"message": node.get("message")}} for node in history]
+            )
+
+        return self._build_profile(username, data, repos_data, commits_by_repo)
+
+    def _build_profile(
+        self,
+        username: str,
+        data: dict,
+        repos_data: List[dict],
+        commits_by_repo: List[List[dict]],
+    ) -> ProfileData:
+        """Build ProfileData from the user, repos and per-repo commits payloads"""
+
+        # Extract recent commit messages or repo descriptions
+        posts_sample = []
+        for repo, commits in zip(repos_data, commits_by_repo):
+            if repo.get("description"):
+                posts_sample.append(f"Repo: {repo['name']} - {repo['description']}")
+
+            for commit in commits:
+                if commit.get("commit", {}).get("message"):
+                    posts_sample.append(f"Commit: {commit['commit']['message']}")
+
+        return ProfileData(
+            platform=Platform.GITHUB,
+            handle=data.get("login", username),
+            name=self._clean_text(data.get("name")),
+            bio=self._clean_text(data.get("bio")),
+            location=self._clean_text(data.get("location")),
+            followers=data.get("followers"),
+            following=data.get("following"),
+            verified=None,  # GitHub doesn't have verification badges
+            posts_sample=posts_sample[:10],  # Limit to 10 samples
+            profile_image_url=data.get("avatar_url"),
+            website=data.get("blog"),
+            joined_date=data.get("created_at"),
+            company=self._clean_text(data.get("company")),
+            email=data.get("email"),
+            additional_data={
+                "public_repos": data.get("public_repos", 0),
+                "public_gists": data.get("public_gists", 0),
+                "hireable": data.get("hireable"),
+                "twitter_username": data.get("twitter_username"),
+            },
+        )
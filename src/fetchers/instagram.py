@@ -1,113 +1,160 @@
+import logging
 import re
 from typing import Optional
 
-from bs4 import BeautifulSoup
+import aiohttp
+import orjson
+from lxml import html as lxml_html
 
 from ..models import Platform, ProfileData
 from .base import BaseFetcher
 
+logger = logging.getLogger(__name__)
+
+_USERNAME_RE = re.compile(r"instagram\.com/([^/]+)")
+
+_SHARED_DATA_RE = re.compile(
+    rb"window\._sharedData\s*=\s*(\{.*?\});</script>", re.DOTALL
+)
+
+# Only the meta tags the profile extraction reads
+_META_XPATH = (
+    '//meta[@property="og:title" or @property="og:description"'
+    ' or @name="description"]'
+)
+
 
 class InstagramFetcher(BaseFetcher):
     """Fetcher for Instagram profiles"""
 
+    hosts = ("instagram.com", "www.instagram.com")
+    login_wall_markers = ("/accounts/login", "/challenge/")
+
     def can_handle(self, url: str) -> bool:
         return "instagram.com" in url.lower()
 
     def extract_profile_data(self, url: str) -> Optional[ProfileData]:
         try:
             # Extract username from URL
-            username_match = re.search(r"instagram\.com/([^/]+)", url)
+            username_match = _USERNAME_RE.search(url)
             if not username_match:
                 return None
 
             username = username_match.group(1)
 
-            response = self.session.get(url)
+            response = self.session.get(url, allow_redirects=True)
 
             if response.status_code != 200:
                 return None
 
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            # Extract basic profile information
-            name = None
-            bio = None
-            followers = None
-            following = None
-            verified = False
-            posts_count = None
-
-            # Try to extract from meta tags
-            for meta in soup.find_all("meta"):
-                property_attr = meta.get("property", "")
-                name_attr = meta.get("name", "")
-                content = meta.get("content", "")
-
-                if property_attr == "og:title":
-                    # Instagram titles usually contain name and handle
-                    if " (@" in content:
-                        name = content.split(" (@")[0].strip()
-                elif property_attr == "og:description":
-                    bio = self._clean_text(content)
-                elif name_attr == "description" and not bio:
-                    bio = self._clean_text(content)
-
-            # Try to extract structured data from script tags
-            scripts = soup.find_all("script")
-            for script in scripts:
-                if script.string and "window._sharedData" in script.string:
-                    try:
-                        import json
-
-                        # Extract JSON data from Instagram's shared data
-                        json_str = script.string
-                        start = json_str.find("{")
-                        end = json_str.rfind("}") + 1
-                        if start >= 0 and end > start:
-                            data = json.loads(json_str[start:end])
-
-                            # Navigate through Instagram's data structure
-                            entry_data = data.get("entry_data", {})
-                            profile_page = entry_data.get("ProfilePage", [{}])[0]
-                            graphql = profile_page.get("graphql", {})
-                            user = graphql.get("user", {})
-
-                            if user:
-                                if not name:
-                                    name = user.get("full_name")
-                                if not bio:
-                                    bio = user.get("biography")
-                                followers = user.get("edge_followed_by", {}).get(
-                                    "count"
-                                )
-                                following = user.get("edge_follow", {}).get("count")
-                                verified = user.get("is_verified", False)
-                                posts_count = user.get(
-                                    "edge_owner_to_timeline_media", {}
-                                ).get("count")
-                    except (json.JSONDecodeError, KeyError):
-                        continue
-
-            # Look for verification badge
-            if soup.find("span", {"aria-label": "Verified"}):
-                verified = True
+            return self._parse_response(username, response.url, response.content)
+
+        except Exception:
+            logger.exception("Error fetching Instagram profile %s", url)
+            return None
+
+    async def fetch_profile_async(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Optional[ProfileData]:
+        try:
+            username_match = _USERNAME_RE.search(url)
+            if not username_match:
+                return None
+
+            username = username_match.group(1)
+
+            page = await self._get_content_async(session, url)
+            if page is None:
+                return None
+
+            final_url, html = page
+            return self._parse_response(username, final_url, html)
+
+        except Exception:
+            logger.exception("Error fetching Instagram profile %s", url)
+            return None
 
+    def _parse_response(
+        self, username: str, final_url: str, html: bytes
+    ) -> ProfileData:
+        """Parse a profile page, skipping the HTML parse for login walls"""
+        if self._is_login_wall(final_url, html):
             return ProfileData(
                 platform=Platform.INSTAGRAM,
                 handle=f"@{username}",
-                name=name,
-                bio=bio,
-                followers=followers,
-                following=following,
-                verified=verified,
-                posts_sample=[],  # Posts require more complex extraction
-                additional_data={
-                    "posts_count": posts_count,
-                    "scraped_from_web": True,
-                    "note": "Limited data due to Instagram restrictions",
-                },
+                additional_data={"error": "login_wall"},
             )
-
-        except Exception as e:
-            print(f"Error fetching Instagram profile: {e}")
-            return None
+        return self._parse_profile(username, html)
+
+    def _parse_profile(self, username: str, html: bytes) -> ProfileData:
+        """Parse an Instagram profile page into ProfileData"""
+        tree = lxml_html.fromstring(html)
+
+        # Extract basic profile information
+        name = None
+        bio = None
+        followers = None
+        following = None
+        verified = False
+        posts_count = None
+
+        # Try to extract from meta tags
+        for meta in tree.xpath(_META_XPATH):
+            property_attr = meta.get("property", "")
+            name_attr = meta.get("name", "")
+            content = meta.get("content", "")
+
+            if property_attr == "og:title":
+                # Instagram titles usually contain name and handle
+                if " (@" in content:
+                    name = content.split(" (@")[0].strip()
+            elif property_attr == "og:description":
+                bio = self._clean_text(content)
+            elif name_attr == "description" and not bio:
+                bio = self._clean_text(content)
+
+        # Extract Instagram's shared data JSON straight from the raw bytes
+        shared_data_match = _SHARED_DATA_RE.search(html)
+        if shared_data_match:
+            try:
+                data = orjson.loads(shared_data_match.group(1))
+
+                # Navigate through Instagram's data structure
+                entry_data = data.get("entry_data", {})
+                profile_page = entry_data.get("ProfilePage", [{}])[0]
+                graphql = profile_page.get("graphql", {})
+                user = graphql.get("user", {})
+
+                if user:
+                    if not name:
+                        name = user.get("full_name")
+                    if not bio:
+                        bio = user.get("biography")
+                    followers = user.get("edge_followed_by", {}).get("count")
+                    following = user.get("edge_follow", {}).get("count")
+                    verified = user.get("is_verified", False)
+                    posts_count = user.get("edge_owner_to_timeline_media", {}).get(
+                        "count"
+                    )
+            except (orjson.JSONDecodeError, KeyError, IndexError):
+                pass
+
+        # Look for verification badge
+        if tree.xpath('//span[@aria-label="Verified"]'):
+            verified = True
+
+        return ProfileData(
+            platform=Platform.INSTAGRAM,
+            handle=f"@{username}",
+            name=name,
+            bio=bio,
+            followers=followers,
+            following=following,
+            verified=verified,
+            posts_sample=[],  # Posts require more complex extraction
+            additional_data={
+                "posts_count": posts_count,
+                "scraped_from_web": True,
+                "note": "Limited data due to Instagram restrictions",
+            },
+        )
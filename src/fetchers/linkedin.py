@@ -1,101 +1,152 @@
+import logging
 import re
 from typing import Optional
 
-from bs4 import BeautifulSoup
+import aiohttp
+import orjson
+from lxml import html as lxml_html
 
 from ..models import Platform, ProfileData
 from .base import BaseFetcher
 
+logger = logging.getLogger(__name__)
+
+_USERNAME_RE = re.compile(r"linkedin\.com/in/([^/]+)")
+
+# Only the meta tags the profile extraction reads
+_META_XPATH = (
+    '//meta[@property="og:title" or @property="og:description"'
+    ' or @name="description"]'
+)
+
 
 class LinkedInFetcher(BaseFetcher):
     """Fetcher for LinkedIn profiles"""
 
+    hosts = ("linkedin.com", "www.linkedin.com")
+    login_wall_markers = ("/authwall", "/uas/login")
+
     def can_handle(self, url: str) -> bool:
         return "linkedin.com" in url.lower()
 
     def extract_profile_data(self, url: str) -> Optional[ProfileData]:
         try:
             # Extract username from URL
-            username_match = re.search(r"linkedin\.com/in/([^/]+)", url)
+            username_match = _USERNAME_RE.search(url)
             if not username_match:
                 return None
 
             username = username_match.group(1)
 
             # LinkedIn heavily restricts scraping, so we'll do basic extraction
-            response = self.session.get(url)
+            response = self.session.get(url, allow_redirects=True)
 
             if response.status_code != 200:
                 return None
 
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            # Extract basic information from meta tags and page structure
-            name = None
-            bio = None
-            location = None
-            company = None
-            job_title = None
-
-            # Try to extract from title tag
-            title_tag = soup.find("title")
-            if title_tag:
-                title_text = title_tag.get_text()
-                # LinkedIn titles usually contain name and job title
-                if " | " in title_text:
-                    parts = title_text.split(" | ")
-                    name = parts[0].strip()
-                    if len(parts) > 1:
-                        job_title = parts[1].strip()
-
-            # Look for meta tags
-            for meta in soup.find_all("meta"):
-                property_attr = meta.get("property", "")
-                name_attr = meta.get("name", "")
-                content = meta.get("content", "")
-
-                if property_attr == "og:title" and not name:
-                    if " | " in content:
-                        name = content.split(" | ")[0].strip()
-                elif property_attr == "og:description":
-                    bio = self._clean_text(content)
-                elif name_attr == "description" and not bio:
-                    bio = self._clean_text(content)
-
-            # Try to extract structured data
-            json_ld_scripts = soup.find_all("script", type="application/ld+json")
-            for script in json_ld_scripts:
-                try:
-                    import json
-
-                    data = json.loads(script.string)
-                    if isinstance(data, dict):
-                        if data.get("@type") == "Person":
-                            if not name and data.get("name"):
-                                name = data["name"]
-                            if not job_title and data.get("jobTitle"):
-                                job_title = data["jobTitle"]
-                            if not company and data.get("worksFor", {}).get("name"):
-                                company = data["worksFor"]["name"]
-                except (json.JSONDecodeError, KeyError):
-                    continue
+            return self._parse_response(username, response.url, response.content)
+
+        except Exception:
+            logger.exception("Error fetching LinkedIn profile %s", url)
+            return None
+
+    async def fetch_profile_async(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Optional[ProfileData]:
+        try:
+            username_match = _USERNAME_RE.search(url)
+            if not username_match:
+                return None
 
+            username = username_match.group(1)
+
+            page = await self._get_content_async(session, url)
+            if page is None:
+                return None
+
+            final_url, html = page
+            return self._parse_response(username, final_url, html)
+
+        except Exception:
+            logger.exception("Error fetching LinkedIn profile %s", url)
+            return None
+
+    def _parse_response(
+        self, username: str, final_url: str, html: bytes
+    ) -> ProfileData:
+        """Parse a profile page, skipping the HTML parse for login walls"""
+        if self._is_login_wall(final_url, html):
             return ProfileData(
                 platform=Platform.LINKEDIN,
                 handle=username,
-                name=name,
-                bio=bio,
-                location=location,
-                company=company,
-                job_title=job_title,
-                verified=None,  # LinkedIn verification is premium-only
-                posts_sample=[],  # Posts require authentication
-                additional_data={
-                    "scraped_from_web": True,
-                    "note": "Limited data due to LinkedIn anti-scraping measures",
-                },
+                additional_data={"error": "login_wall"},
             )
-
-        except Exception as e:
-            print(f"Error fetching LinkedIn profile: {e}")
-            return None
+        return self._parse_profile(username, html)
+
+    def _parse_profile(self, username: str, html: bytes) -> ProfileData:
+        """Parse a LinkedIn profile page into ProfileData"""
+        tree = lxml_html.fromstring(html)
+
+        # Extract basic information from meta tags and page structure
+        name = None
+        bio = None
+        location = None
+        company = None
+        job_title = None
+
+        # Try to extract from title tag
+        title_text = tree.findtext(".//title")
+        if title_text:
+            # LinkedIn titles usually contain name and job title
+            if " | " in title_text:
+                parts = title_text.split(" | ")
+                name = parts[0].strip()
+                if len(parts) > 1:
+                    job_title = parts[1].strip()
+
+        # Look for meta tags
+        for meta in tree.xpath(_META_XPATH):
+            property_attr = meta.get("property", "")
+            name_attr = meta.get("name", "")
+            content = meta.get("content", "")
+
+            if property_attr == "og:title" and not name:
+                if " | " in content:
+                    name = content.split(" | ")[0].strip()
+            elif property_attr == "og:description":
+                bio = self._clean_text(content)
+            elif name_attr == "description" and not bio:
+                bio = self._clean_text(content)
+
+        # Try to extract structured data
+        json_ld_scripts = tree.xpath('//script[@type="application/ld+json"]/text()')
+        for script_text in json_ld_scripts:
+            try:
+                # xpath text results are str subclasses, which orjson rejects
+                data = orjson.loads(str(script_text))
+                if isinstance(data, dict):
+                    if data.get("@type") == "Person":
+                        if not name and data.get("name"):
+                            name = data["name"]
+                        if not job_title and data.get("jobTitle"):
+                            job_title = data["jobTitle"]
+                        if not company and data.get("worksFor", {}).get("name"):
+                            company = data["worksFor"]["name"]
+            except (orjson.JSONDecodeError, KeyError):
+                continue
+
+        return ProfileData(
+            platform=Platform.LINKEDIN,
+            handle=username,
+            name=name,
+            bio=bio,
+            location=location,
+            company=company,
+            job_title=job_title,
+            verified=None,  # LinkedIn verification is premium-only
+            posts_sample=[],  # Posts require authentication
+            additional_data={
+                "scraped_from_web": True,
+                "note": "Limited data due to LinkedIn anti-scraping measures",
+            },
+        )
@@ -1,11 +1,31 @@
-from typing import List, Optional
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Union
+from urllib.parse import urlsplit
 
-from ..models import ProfileData
+import aiohttp
+from pydantic import ValidationError
+
+from ..cache import TieredCache, cache_key
+from ..models import Platform, ProfileData
+from .base import DEFAULT_HEADERS, BaseFetcher
 from .github import GitHubFetcher
 from .instagram import InstagramFetcher
 from .linkedin import LinkedInFetcher
 from .twitter import TwitterFetcher
 
+logger = logging.getLogger(__name__)
+
+# Seconds a fetched profile stays fresh; scraped platforms change faster
+PROFILE_TTL_BY_PLATFORM = {
+    Platform.GITHUB: 6 * 60 * 60,
+    Platform.LINKEDIN: 6 * 60 * 60,
+    Platform.INSTAGRAM: 60 * 60,
+    Platform.TWITTER: 60 * 60,
+}
+
 
 class FetcherManager:
     """Manages all profile fetchers and routes URLs to appropriate handlers"""
@@ -17,30 +37,155 @@ class FetcherManager:
             LinkedInFetcher(),
             InstagramFetcher(),
         ]
+        self._by_host = {
+            host: fetcher for fetcher in self.fetchers for host in fetcher.hosts
+        }
+        self.cache = TieredCache("profiles")
 
-    def fetch_profile(self, url: str) -> Optional[ProfileData]:
-        """Fetch profile data from a URL using the appropriate fetcher"""
+    def _get_fetcher(self, url: str) -> Optional[BaseFetcher]:
+        """Return the fetcher registered for the URL's host"""
+        fetcher = self._by_host.get((urlsplit(url).hostname or "").lower())
+        if fetcher is not None:
+            return fetcher
+
+        # Unlisted hosts such as mobile.twitter.com fall back to can_handle
         for fetcher in self.fetchers:
             if fetcher.can_handle(url):
-                try:
-                    return fetcher.extract_profile_data(url)
-                except Exception as e:
-                    print(
-                        f"Error fetching {url} with {fetcher.__class__.__name__}: {e}"
-                    )
-                    return None
-
-        print(f"No fetcher available for URL: {url}")
+                return fetcher
         return None
 
+    def fetch_profile(self, url: str) -> Optional[ProfileData]:
+        """Fetch profile data from a URL using the appropriate fetcher"""
+        cached = self._get_cached(url)
+        if cached is not None:
+            return cached
+
+        fetcher = self._get_fetcher(url)
+        if fetcher is None:
+            logger.warning("No fetcher available for URL: %s", url)
+            return None
+
+        started = time.perf_counter()
+        try:
+            profile = fetcher.extract_profile_data(url)
+        except Exception:
+            logger.exception(
+                "Error fetching %s with %s", url, fetcher.__class__.__name__
+            )
+            return None
+        finally:
+            self._log_timing(url, fetcher, started)
+
+        self._store_cached(url, profile)
+        return profile
+
+    def invalidate(self, url: str) -> None:
+        """Force the next fetch of a URL to go back to the network"""
+        self.cache.delete(cache_key(url))
+        fetcher = self._get_fetcher(url)
+        if fetcher is not None:
+            fetcher.invalidate(url)
+
     def fetch_multiple_profiles(self, urls: List[str]) -> List[ProfileData]:
-        """Fetch data from multiple profile URLs"""
+        """Fetch data from multiple profile URLs concurrently"""
+        if not urls:
+            return []
+
+        results: Sequence[Union[Optional[ProfileData], BaseException]]
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            results = asyncio.run(self._fetch_all(urls))
+        else:
+            # asyncio.run cannot nest inside a running loop, so use threads
+            results = self._fetch_all_threaded(urls)
+
         profiles = []
-        for url in urls:
-            profile = self.fetch_profile(url)
-            if profile:
-                profiles.append(profile)
+        for url, result in zip(urls, results):
+            if isinstance(result, ProfileData):
+                profiles.append(result)
             else:
-                print(f"Failed to fetch profile from: {url}")
+                if isinstance(result, BaseException):
+                    logger.error("Error fetching %s", url, exc_info=result)
+                logger.warning("Failed to fetch profile from: %s", url)
 
         return profiles
+
+    def _fetch_all_threaded(self, urls: List[str]) -> List[Optional[ProfileData]]:
+        """Fetch all URLs with the blocking fetchers on a thread pool"""
+        with ThreadPoolExecutor(max_workers=min(16, len(urls))) as executor:
+            return list(executor.map(self.fetch_profile, urls))
+
+    async def _fetch_all(
+        self, urls: List[str]
+    ) -> List[Union[Optional[ProfileData], BaseException]]:
+        """Fetch all URLs over a single shared aiohttp session"""
+        # aiohttp speaks HTTP/1.1 only; keep-alive on the shared connector lets
+        # the concurrent fetches to one host reuse its pooled connections
+        connector = aiohttp.TCPConnector(limit_per_host=64)
+        async with aiohttp.ClientSession(
+            connector=connector, headers=DEFAULT_HEADERS
+        ) as session:
+            return await asyncio.gather(
+                *(self._dispatch(session, url) for url in urls),
+                return_exceptions=True,
+            )
+
+    async def _dispatch(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Optional[ProfileData]:
+        """Route a URL to the appropriate fetcher's async implementation"""
+        cached = self._get_cached(url)
+        if cached is not None:
+            return cached
+
+        fetcher = self._get_fetcher(url)
+        if fetcher is None:
+            logger.warning("No fetcher available for URL: %s", url)
+            return None
+
+        started = time.perf_counter()
+        try:
+            profile = await fetcher.fetch_profile_async(session, url)
+        finally:
+            self._log_timing(url, fetcher, started)
+        self._store_cached(url, profile)
+        return profile
+
+    def _log_timing(self, url: str, fetcher: BaseFetcher, started: float) -> None:
+        """Emit a structured timing record for a single profile fetch"""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            "Fetched %s with %s in %.0f ms",
+            url,
+            fetcher.__class__.__name__,
+            elapsed_ms,
+            extra={
+                "url": url,
+                "ms": elapsed_ms,
+                "fetcher": fetcher.__class__.__name__,
+            },
+        )
+
+    def _get_cached(self, url: str) -> Optional[ProfileData]:
+        """Return a still-fresh cached profile for the URL, if any"""
+        key = cache_key(url)
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        try:
+            return ProfileData(**cached)
+        except ValidationError:
+            # Stored under an older schema; treat as a miss and refetch
+            self.cache.delete(key)
+            return None
+
+    def _store_cached(self, url: str, profile: Optional[ProfileData]) -> None:
+        """Cache a successfully fetched profile with its platform's TTL"""
+        if profile is None or profile.additional_data.get("error"):
+            return
+        self.cache.set(
+            cache_key(url),
+            profile.model_dump(mode="json"),
+            expire=PROFILE_TTL_BY_PLATFORM[profile.platform],
+        )
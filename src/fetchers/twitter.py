@@ -1,22 +1,142 @@
+import logging
 import re
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
+import aiohttp
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from lxml import etree
+from pydantic import ValidationError
 
+from ..cache import TieredCache, cache_key
 from ..models import Platform, ProfileData
 from .base import BaseFetcher
 
+logger = logging.getLogger(__name__)
+
+_USERNAME_RE = re.compile(r"(?:twitter\.com|x\.com)/([^/]+)")
+
+# The only tags _parse_profile inspects; everything else is never built
+_PROFILE_STRAINER = SoupStrainer(["title", "meta", "div", "span"])
+
+# Attribute carried by the verified badge next to the profile name
+_VERIFIED_MARKER = b'aria-label="Verified account"'
+
+# Meta property/name keys read for the name and bio; og:description wins
+_META_KEYS = ("og:title", "og:description", "description")
+
+# Post samples collected per profile
+MAX_POSTS_SAMPLE = 5
+
+# Bytes read per streamed chunk; the head and first posts arrive early
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# How long parsed profiles are kept for If-None-Match revalidation
+ETAG_TTL = 24 * 60 * 60
+
+
+class _ProfileScanner:
+    """Incremental parse of a streamed profile page that stops once complete"""
+
+    def __init__(
+        self,
+        clean_text: Callable[[Optional[str]], Optional[str]],
+        encoding: Optional[str] = None,
+    ):
+        # Use the HTTP charset; lxml would otherwise guess from the bytes
+        self._parser = etree.HTMLPullParser(
+            events=("start", "end"), encoding=encoding or "utf-8"
+        )
+        self._clean_text = clean_text
+        self._head_closed = False
+        self._body_closed = False
+        self.failed = False
+        self.title: Optional[str] = None
+        self.meta_content: Dict[str, str] = {}
+        self.posts_sample: List[str] = []
+        self.verified = False
+
+    @property
+    def done(self) -> bool:
+        """Whether every field the profile needs has been seen"""
+        meta_done = self._head_closed or len(self.meta_content) == len(_META_KEYS)
+        # The badge may follow the posts, so only its absence needs the whole body
+        badge_done = self.verified or self._body_closed
+        return meta_done and badge_done and len(self.posts_sample) == MAX_POSTS_SAMPLE
+
+    def feed(self, chunk: bytes) -> bool:
+        """Parse another chunk, returning True once no more input is needed"""
+        if self.failed:
+            return False
+        try:
+            self._parser.feed(chunk)
+            self._read_events()
+        except etree.LxmlError:
+            self.failed = True
+            return False
+        return self.done
+
+    def close(self) -> None:
+        """Flush the parser at the end of the stream"""
+        if self.failed:
+            return
+        try:
+            self._parser.close()
+            self._read_events()
+        except etree.LxmlError:
+            self.failed = True
+
+    def _read_events(self) -> None:
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._on_start(element)
+            else:
+                self._on_end(element)
+
+    def _on_start(self, element: etree._Element) -> None:
+        """Handle tags whose attributes are all we need"""
+        if element.tag == "meta":
+            key = element.get("property") or element.get("name")
+            if key in _META_KEYS and key not in self.meta_content:
+                self.meta_content[key] = element.get("content", "")
+        elif element.get("aria-label") == "Verified account":
+            self.verified = True
+
+    def _on_end(self, element: etree._Element) -> None:
+        """Handle tags whose text is complete once they close"""
+        tag = element.tag
+        if tag == "head":
+            self._head_closed = True
+        elif tag == "body":
+            self._body_closed = True
+        elif tag == "title":
+            if self.title is None:
+                self.title = element.text or ""
+        elif tag in ("div", "span") and len(element) == 0:
+            self._add_post(element.text)
+
+    def _add_post(self, raw: Optional[str]) -> None:
+        if len(self.posts_sample) < MAX_POSTS_SAMPLE:
+            text = self._clean_text(raw)
+            if text and 10 < len(text) < 280:
+                self.posts_sample.append(text)
+
 
 class TwitterFetcher(BaseFetcher):
     """Fetcher for Twitter/X profiles"""
 
+    hosts = ("twitter.com", "www.twitter.com", "x.com", "www.x.com")
+
+    def __init__(self):
+        super().__init__()
+        self.etag_cache = TieredCache("twitter_etags")
+
     def can_handle(self, url: str) -> bool:
         return any(domain in url.lower() for domain in ["twitter.com", "x.com"])
 
     def extract_profile_data(self, url: str) -> Optional[ProfileData]:
         try:
             # Extract username from URL
-            username_match = re.search(r"(?:twitter\.com|x\.com)/([^/]+)", url)
+            username_match = _USERNAME_RE.search(url)
             if not username_match:
                 return None
 
@@ -24,74 +144,187 @@ class TwitterFetcher(BaseFetcher):
 
             # Note: Twitter API requires authentication, so we'll use web scraping
             # In production, you'd want to use the official Twitter API v2
-            response = self.session.get(url)
+            key = cache_key(url)
+            cached = self._get_revalidation_entry(key)
+            headers = {"If-None-Match": cached[0]} if cached else {}
+            with self.session.get(url, stream=True, headers=headers) as response:
+                if response.status_code == 304 and cached is not None:
+                    return cached[1]
+                if response.status_code != 200:
+                    return None
+
+                # requests assumes ISO-8859-1 for text/* without a charset
+                content_type = response.headers.get("Content-Type", "").lower()
+                encoding = response.encoding if "charset=" in content_type else None
+                scanner = _ProfileScanner(self._clean_text, encoding)
+                chunks = []
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    chunks.append(chunk)
+                    if scanner.feed(chunk):
+                        break
+                else:
+                    scanner.close()
+                etag = response.headers.get("ETag")
+
+            profile = self._finish_scan(username, scanner, chunks)
+            self._remember(key, etag, profile)
+            return profile
+
+        except Exception:
+            logger.exception("Error fetching Twitter profile %s", url)
+            return None
 
-            if response.status_code != 200:
+    async def fetch_profile_async(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Optional[ProfileData]:
+        try:
+            username_match = _USERNAME_RE.search(url)
+            if not username_match:
                 return None
 
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            # Extract basic profile information
-            name = None
-            bio = None
-            followers = None
-            following = None
-            verified = False
-            location = None
-            website = None
-            posts_sample = []
-
-            # Try to extract name from title or meta tags
-            title_tag = soup.find("title")
-            if title_tag:
-                title_text = title_tag.get_text()
-                if " (@" in title_text:
-                    name = title_text.split(" (@")[0].strip()
-
-            # Look for meta tags with profile information
-            for meta in soup.find_all("meta"):
-                property_attr = meta.get("property", "")
-                name_attr = meta.get("name", "")
-                content = meta.get("content", "")
-
-                if property_attr == "og:title" and not name:
-                    if " (@" in content:
-                        name = content.split(" (@")[0].strip()
-                elif property_attr == "og:description":
-                    bio = self._clean_text(content)
-                elif name_attr == "description" and not bio:
-                    bio = self._clean_text(content)
-
-            # Try to extract tweet text as samples
-            tweet_elements = soup.find_all(
-                ["div", "span"], string=re.compile(r".{10,}")
-            )
-            for element in tweet_elements[:5]:  # Limit to first 5
-                text = self._clean_text(element.get_text())
-                if text and len(text) > 10 and len(text) < 280:
-                    posts_sample.append(text)
-
-            # Look for verified badge indicators
-            if soup.find("svg", {"aria-label": "Verified account"}):
-                verified = True
-
-            return ProfileData(
-                platform=Platform.TWITTER,
-                handle=f"@{username}",
-                name=name,
-                bio=bio,
-                location=location,
-                followers=followers,
-                following=following,
-                verified=verified,
-                posts_sample=posts_sample,
-                website=website,
-                additional_data={
-                    "scraped_from_web": True,
-                    "note": "Limited data due to Twitter API restrictions",
-                },
-            )
+            username = username_match.group(1)
+
+            key = cache_key(url)
+            cached = self._get_revalidation_entry(key)
+            headers = {"If-None-Match": cached[0]} if cached else {}
+            async with self._request_with_retry(
+                session, "GET", url, headers=headers
+            ) as response:
+                if response.status == 304 and cached is not None:
+                    return cached[1]
+                if response.status != 200:
+                    return None
+
+                scanner = _ProfileScanner(self._clean_text, response.charset)
+                chunks = []
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    chunks.append(chunk)
+                    if scanner.feed(chunk):
+                        break
+                else:
+                    scanner.close()
+                etag = response.headers.get("ETag")
 
-        except Exception as e:
-            print(f"Error fetching Twitter profile: {e}")
+            profile = self._finish_scan(username, scanner, chunks)
+            self._remember(key, etag, profile)
+            return profile
+
+        except Exception:
+            logger.exception("Error fetching Twitter profile %s", url)
+            return None
+
+    def invalidate(self, url: str) -> None:
+        """Forget the revalidation entry so the next fetch downloads the page"""
+        self.etag_cache.delete(cache_key(url))
+
+    def _get_revalidation_entry(self, key: str) -> Optional[Tuple[str, ProfileData]]:
+        """Return the cached ETag and profile, dropping entries that no longer load"""
+        cached = self.etag_cache.get(key)
+        if cached is None:
+            return None
+        try:
+            return cached["etag"], ProfileData(**cached["profile"])
+        except ValidationError:
+            # Stored under an older schema; fetch the page afresh
+            self.etag_cache.delete(key)
             return None
+
+    def _remember(self, key: str, etag: Optional[str], profile: ProfileData) -> None:
+        """Keep a parsed profile for revalidation when the page carries an ETag"""
+        if etag:
+            self.etag_cache.set(
+                key,
+                {"etag": etag, "profile": profile.model_dump(mode="json")},
+                expire=ETAG_TTL,
+            )
+
+    def _finish_scan(
+        self, username: str, scanner: _ProfileScanner, chunks: List[bytes]
+    ) -> ProfileData:
+        """Build the profile from a scan, re-parsing the page if the scan failed"""
+        if scanner.failed:
+            logger.debug("Pull parse failed for @%s; parsing the whole page", username)
+            return self._parse_profile(username, b"".join(chunks))
+        return self._build_profile(
+            username,
+            scanner.title,
+            scanner.meta_content,
+            scanner.posts_sample,
+            scanner.verified,
+        )
+
+    def _parse_profile(self, username: str, html: bytes) -> ProfileData:
+        """Parse a whole Twitter/X profile page into ProfileData"""
+        soup = BeautifulSoup(html, "lxml", parse_only=_PROFILE_STRAINER)
+
+        title_tag = soup.find("title")
+        title = title_tag.get_text() if title_tag else None
+
+        # Look for meta tags with profile information
+        meta_content: Dict[str, str] = {}
+        for meta in soup.find_all("meta"):
+            key = meta.get("property") or meta.get("name")
+            if isinstance(key, str) and key in _META_KEYS and key not in meta_content:
+                content = meta.get("content")
+                meta_content[key] = content if isinstance(content, str) else ""
+                if len(meta_content) == len(_META_KEYS):
+                    break
+
+        # Try to extract tweet text as samples
+        posts_sample = []
+        for element in soup.descendants:
+            if not isinstance(element, Tag) or element.name not in ("div", "span"):
+                continue
+            # Only leaf-text elements, as find_all(string=...) matched before
+            text = self._clean_text(element.string)
+            if text and 10 < len(text) < 280:
+                posts_sample.append(text)
+                if len(posts_sample) == MAX_POSTS_SAMPLE:
+                    break
+
+        # Look for verified badge indicators in the raw body, skipping the tree
+        body_start = max(html.find(b"<body"), 0)
+        verified = html.find(_VERIFIED_MARKER, body_start) >= 0
+
+        return self._build_profile(
+            username, title, meta_content, posts_sample, verified
+        )
+
+    def _build_profile(
+        self,
+        username: str,
+        title: Optional[str],
+        meta_content: Dict[str, str],
+        posts_sample: List[str],
+        verified: bool,
+    ) -> ProfileData:
+        """Assemble ProfileData from the title, meta tags and post samples"""
+        name = None
+
+        # Try to extract name from title or meta tags
+        if title and " (@" in title:
+            name = title.split(" (@")[0].strip()
+
+        og_title = meta_content.get("og:title", "")
+        if not name and " (@" in og_title:
+            name = og_title.split(" (@")[0].strip()
+        bio = self._clean_text(
+            meta_content.get("og:description") or meta_content.get("description")
+        )
+
+        return ProfileData(
+            platform=Platform.TWITTER,
+            handle=f"@{username}",
+            name=name,
+            bio=bio,
+            location=None,
+            followers=None,
+            following=None,
+            verified=verified,
+            posts_sample=posts_sample,
+            website=None,
+            additional_data={
+                "scraped_from_web": True,
+                "note": "Limited data due to Twitter API restrictions",
+            },
+        )
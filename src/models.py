@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 
 
 class Platform(str, Enum):
@@ -11,9 +11,15 @@ class Platform(str, Enum):
     GITHUB = "github"
 
 
+# Display names used in reports, matching the former value.title() rendering
+PLATFORM_LABELS = {platform: platform.value.title() for platform in Platform}
+
+
 class ProfileData(BaseModel):
     """Normalized profile data schema"""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     platform: Platform
     handle: str
     name: Optional[str] = None
@@ -42,6 +48,8 @@ class VerificationRequest(BaseModel):
 class TrustScore(BaseModel):
     """Trust score breakdown"""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     overall: int = Field(..., ge=0, le=100)
     reputation: int = Field(..., ge=0, le=100)
     consistency: int = Field(..., ge=0, le=100)
@@ -51,6 +59,8 @@ class TrustScore(BaseModel):
 class Discrepancy(BaseModel):
     """Identified discrepancy between profiles"""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     field: str
     platforms: List[Platform]
     values: Dict[Platform, str]
@@ -60,6 +70,8 @@ class Discrepancy(BaseModel):
 class VerificationReport(BaseModel):
     """Final verification report"""
 
+    model_config = ConfigDict(frozen=True)
+
     trust_score: TrustScore
     profiles_analyzed: List[ProfileData]
     consistency_score: int = Field(..., ge=0, le=100)
@@ -1,55 +1,135 @@
+import io
 import os
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple, Union
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
 from reportlab.lib.units import inch
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
-from .models import VerificationReport
+from .models import PLATFORM_LABELS, TrustScore, VerificationReport
+
+# Table styles for the PDF report sections
+META_TABLE_STYLE = TableStyle(
+    [
+        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+        ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 10),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+    ]
+)
+
+TRUST_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+    ]
+)
+
+PROFILE_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+    ]
+)
+
+# Markdown profile table row: platform, handle, name, verified, followers
+PROFILE_ROW_FMT = "| {0} | {1} | {2} | {3} | {4} |\n"
+
+# Static closing section of every Markdown report
+MARKDOWN_FOOTER = """---
+
+## ⚡ How to Interpret This Report
+
+- **Trust Score (0-100):** Higher scores indicate more trustworthy and consistent profiles
+- **Same Person Confidence:** Likelihood that all profiles belong to the same individual
+- **Red Flags:** Concerning patterns that may indicate fake or compromised accounts
+- **Strengths:** Positive signals that support authenticity and credibility
+
+*This report was generated using automated analysis. Manual verification is recommended for high-stakes decisions.*
+"""
+
+
+def _score_bands(high: str, moderate: str, low: str, very_low: str) -> Tuple[str, ...]:
+    """Precompute the label for every score from 0 to 100"""
+
+    def label(score: int) -> str:
+        if score >= 80:
+            return high
+        elif score >= 60:
+            return moderate
+        elif score >= 40:
+            return low
+        else:
+            return very_low
+
+    return tuple(label(score) for score in range(101))
+
+
+def _build_styles() -> StyleSheet1:
+    """Set up custom styles for PDF generation"""
+    styles = getSampleStyleSheet()
+    styles.add(
+        ParagraphStyle(
+            name="CustomTitle",
+            parent=styles["Heading1"],
+            fontSize=18,
+            spaceAfter=30,
+            textColor=colors.darkblue,
+        )
+    )
+
+    styles.add(
+        ParagraphStyle(
+            name="SectionHeader",
+            parent=styles["Heading2"],
+            fontSize=14,
+            spaceBefore=20,
+            spaceAfter=10,
+            textColor=colors.darkblue,
+        )
+    )
+
+    styles.add(
+        ParagraphStyle(
+            name="ScoreStyle",
+            parent=styles["Normal"],
+            fontSize=24,
+            alignment=1,  # Center alignment
+            textColor=colors.darkgreen,
+        )
+    )
+    return styles
 
 
 class ReportGenerator:
     """Generates verification reports in Markdown and PDF formats"""
 
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-
-    def _setup_custom_styles(self):
-        """Set up custom styles for PDF generation"""
-        self.styles.add(
-            ParagraphStyle(
-                name="CustomTitle",
-                parent=self.styles["Heading1"],
-                fontSize=18,
-                spaceAfter=30,
-                textColor=colors.darkblue,
-            )
-        )
+    # Labels indexed by score; TrustScore validates scores to 0-100
+    _TRUST_LEVEL = _score_bands(
+        "High Trust", "Moderate Trust", "Low Trust", "Very Low Trust"
+    )
+    _TRUST_EMOJI = _score_bands("🟢", "🟡", "🟠", "🔴")
+    _ASSESSMENT = _score_bands("Excellent", "Good", "Fair", "Poor")
 
-        self.styles.add(
-            ParagraphStyle(
-                name="SectionHeader",
-                parent=self.styles["Heading2"],
-                fontSize=14,
-                spaceBefore=20,
-                spaceAfter=10,
-                textColor=colors.darkblue,
-            )
-        )
+    # Built once and shared; reportlab only reads styles while rendering
+    _STYLES = _build_styles()
 
-        self.styles.add(
-            ParagraphStyle(
-                name="ScoreStyle",
-                parent=self.styles["Normal"],
-                fontSize=24,
-                alignment=1,  # Center alignment
-                textColor=colors.darkgreen,
-            )
-        )
+    def __init__(self):
+        self.styles = self._STYLES
 
     def generate_markdown_report(
         self, report: VerificationReport, output_path: Optional[str] = None
@@ -63,7 +143,8 @@ class ReportGenerator:
         trust_level = self._get_trust_level(overall_score)
         trust_emoji = self._get_trust_emoji(overall_score)
 
-        markdown_content = f"""# Social Profile Verification Report {trust_emoji}
+        parts = [
+            f"""# Social Profile Verification Report {trust_emoji}
 
 **Generated:** {timestamp}
 **Profiles Analyzed:** {len(report.profiles_analyzed)}
@@ -75,11 +156,14 @@ class ReportGenerator:
 
 | Metric | Score | Assessment |
 |--------|-------|------------|
-| **Overall Trust** | {report.trust_score.overall}/100 | {self._get_assessment(report.trust_score.overall)} |
-| **Reputation** | {report.trust_score.reputation}/100 | {self._get_assessment(report.trust_score.reputation)} |
-| **Consistency** | {report.trust_score.consistency}/100 | {self._get_assessment(report.trust_score.consistency)} |
-| **Content Quality** | {report.trust_score.content_quality}/100 | {self._get_assessment(report.trust_score.content_quality)} |
-
+"""
+        ]
+        parts.extend(
+            f"| **{label}** | {score}/100 | {assessment} |\n"
+            for label, score, assessment in self._build_score_rows(report.trust_score)
+        )
+        parts.append(
+            """
 ---
 
 ## 📊 Profile Summary
@@ -87,6 +171,7 @@ class ReportGenerator:
 | Platform | Handle | Name | Verified | Followers |
 |----------|--------|------|----------|-----------|
 """
+        )
 
         # Add profile data table
         for profile in report.profiles_analyzed:
@@ -96,69 +181,74 @@ class ReportGenerator:
             followers = f"{profile.followers:,}" if profile.followers else "N/A"
             name = profile.name or "N/A"
 
-            markdown_content += f"| {profile.platform.value.title()} | {profile.handle} | {name} | {verified_icon} | {followers} |\n"
+            parts.append(
+                PROFILE_ROW_FMT.format(
+                    PLATFORM_LABELS[profile.platform],
+                    profile.handle,
+                    name,
+                    verified_icon,
+                    followers,
+                )
+            )
 
-        markdown_content += "\n---\n\n"
+        parts.append("\n---\n\n")
 
         # Analysis Summary
-        markdown_content += f"""## 📝 Analysis Summary
+        parts.append(
+            f"""## 📝 Analysis Summary
 
 {report.analysis_summary}
 
 ---
 
 """
+        )
 
         # Consistency Analysis
         if report.discrepancies:
-            markdown_content += "## ⚠️ Discrepancies Detected\n\n"
+            parts.append("## ⚠️ Discrepancies Detected\n\n")
             for disc in report.discrepancies:
                 severity_emoji = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(
                     disc.severity, "❔"
                 )
-                platforms_str = ", ".join([p.value.title() for p in disc.platforms])
+                platforms_str = ", ".join([PLATFORM_LABELS[p] for p in disc.platforms])
 
-                markdown_content += f"### {severity_emoji} {disc.field.replace('_', ' ').title()} Mismatch ({disc.severity.upper()})\n\n"
-                markdown_content += f"**Platforms:** {platforms_str}\n\n"
+                parts.append(
+                    f"### {severity_emoji} {disc.field.replace('_', ' ').title()} Mismatch ({disc.severity.upper()})\n\n"
+                )
+                parts.append(f"**Platforms:** {platforms_str}\n\n")
 
-                for platform, value in disc.values.items():
-                    markdown_content += f"- **{platform.value.title()}:** {value}\n"
+                parts.extend(
+                    f"- **{PLATFORM_LABELS[platform]}:** {value}\n"
+                    for platform, value in disc.values.items()
+                )
 
-                markdown_content += "\n"
+                parts.append("\n")
 
         # Red Flags
         if report.red_flags:
-            markdown_content += "## 🚩 Red Flags\n\n"
-            for flag in report.red_flags:
-                markdown_content += f"- {flag}\n"
-            markdown_content += "\n"
+            parts.append("## 🚩 Red Flags\n\n")
+            parts.extend(f"- {flag}\n" for flag in report.red_flags)
+            parts.append("\n")
 
         # Strengths
         if report.strengths:
-            markdown_content += "## ✅ Strengths\n\n"
-            for strength in report.strengths:
-                markdown_content += f"- {strength}\n"
-            markdown_content += "\n"
+            parts.append("## ✅ Strengths\n\n")
+            parts.extend(f"- {strength}\n" for strength in report.strengths)
+            parts.append("\n")
 
         # Citations
         if report.citations:
-            markdown_content += "## 📚 Citations & Evidence\n\n"
-            for i, citation in enumerate(report.citations, 1):
-                markdown_content += f"{i}. {citation}\n"
-            markdown_content += "\n"
+            parts.append("## 📚 Citations & Evidence\n\n")
+            parts.extend(
+                f"{i}. {citation}\n" for i, citation in enumerate(report.citations, 1)
+            )
+            parts.append("\n")
 
         # Footer
-        markdown_content += """---
-
-## ⚡ How to Interpret This Report
-
-- **Trust Score (0-100):** Higher scores indicate more trustworthy and consistent profiles
-- **Same Person Confidence:** Likelihood that all profiles belong to the same individual
-- **Red Flags:** Concerning patterns that may indicate fake or compromised accounts
-- **Strengths:** Positive signals that support authenticity and credibility
+        parts.append(MARKDOWN_FOOTER)
 
-*This report was generated using automated analysis. Manual verification is recommended for high-stakes decisions.*
-"""
+        markdown_content = "".join(parts)
 
         # Save to file if path provided
         if output_path:
@@ -167,11 +257,17 @@ class ReportGenerator:
 
         return markdown_content
 
-    def generate_pdf_report(self, report: VerificationReport, output_path: str) -> None:
-        """Generate a PDF verification report"""
+    def generate_pdf_report(
+        self,
+        report: VerificationReport,
+        output_path: Union[str, "os.PathLike[str]", BinaryIO],
+    ) -> None:
+        """Generate a PDF verification report to a path or binary file object"""
 
+        # Render in memory so the file is written in one go
+        buffer = io.BytesIO()
         doc = SimpleDocTemplate(
-            output_path,
+            buffer,
             pagesize=letter,
             rightMargin=72,
             leftMargin=72,
@@ -198,16 +294,7 @@ class ReportGenerator:
         ]
 
         meta_table = Table(meta_data, colWidths=[2 * inch, 3 * inch])
-        meta_table.setStyle(
-            TableStyle(
-                [
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, -1), 10),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-                ]
-            )
-        )
+        meta_table.setStyle(META_TABLE_STYLE)
 
         story.append(meta_table)
         story.append(Spacer(1, 20))
@@ -226,44 +313,14 @@ class ReportGenerator:
         story.append(Spacer(1, 15))
 
         # Trust Score Breakdown
-        trust_data = [
-            ["Metric", "Score", "Assessment"],
-            [
-                "Overall Trust",
-                f"{report.trust_score.overall}/100",
-                self._get_assessment(report.trust_score.overall),
-            ],
-            [
-                "Reputation",
-                f"{report.trust_score.reputation}/100",
-                self._get_assessment(report.trust_score.reputation),
-            ],
-            [
-                "Consistency",
-                f"{report.trust_score.consistency}/100",
-                self._get_assessment(report.trust_score.consistency),
-            ],
-            [
-                "Content Quality",
-                f"{report.trust_score.content_quality}/100",
-                self._get_assessment(report.trust_score.content_quality),
-            ],
-        ]
+        trust_data = [["Metric", "Score", "Assessment"]]
+        trust_data.extend(
+            [label, f"{score}/100", assessment]
+            for label, score, assessment in self._build_score_rows(report.trust_score)
+        )
 
         trust_table = Table(trust_data, colWidths=[1.5 * inch, 1 * inch, 2 * inch])
-        trust_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, -1), 9),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
+        trust_table.setStyle(TRUST_TABLE_STYLE)
 
         story.append(trust_table)
         story.append(Spacer(1, 20))
@@ -285,7 +342,7 @@ class ReportGenerator:
 
             profile_data.append(
                 [
-                    profile.platform.value.title(),
+                    PLATFORM_LABELS[profile.platform],
                     profile.handle,
                     name,
                     verified_text,
@@ -297,19 +354,7 @@ class ReportGenerator:
             profile_data,
             colWidths=[1 * inch, 1.5 * inch, 1.5 * inch, 0.8 * inch, 0.7 * inch],
         )
-        profile_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, -1), 8),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
+        profile_table.setStyle(PROFILE_TABLE_STYLE)
 
         story.append(profile_table)
         story.append(Spacer(1, 15))
@@ -340,35 +385,32 @@ class ReportGenerator:
         # Build PDF
         doc.build(story)
 
+        data = buffer.getvalue()
+        if isinstance(output_path, (str, os.PathLike)):
+            Path(output_path).write_bytes(data)
+        else:
+            output_path.write(data)
+
+    def _build_score_rows(self, trust_score: TrustScore) -> List[Tuple[str, int, str]]:
+        """Label, score and assessment for each trust score component"""
+        return [
+            (label, score, self._ASSESSMENT[score])
+            for label, score in (
+                ("Overall Trust", trust_score.overall),
+                ("Reputation", trust_score.reputation),
+                ("Consistency", trust_score.consistency),
+                ("Content Quality", trust_score.content_quality),
+            )
+        ]
+
     def _get_trust_level(self, score: int) -> str:
         """Get trust level description based on score"""
-        if score >= 80:
-            return "High Trust"
-        elif score >= 60:
-            return "Moderate Trust"
-        elif score >= 40:
-            return "Low Trust"
-        else:
-            return "Very Low Trust"
+        return self._TRUST_LEVEL[score]
 
     def _get_trust_emoji(self, score: int) -> str:
         """Get emoji based on trust score"""
-        if score >= 80:
-            return "🟢"
-        elif score >= 60:
-            return "🟡"
-        elif score >= 40:
-            return "🟠"
-        else:
-            return "🔴"
+        return self._TRUST_EMOJI[score]
 
     def _get_assessment(self, score: int) -> str:
         """Get assessment text based on score"""
-        if score >= 80:
-            return "Excellent"
-        elif score >= 60:
-            return "Good"
-        elif score >= 40:
-            return "Fair"
-        else:
-            return "Poor"
+        return self._ASSESSMENT[score]